@@ -1,3 +1,10 @@
-from .config import settings  # re-export for convenience
-
 __all__ = ["settings"]
+
+
+def __getattr__(name: str):
+    # re-export for convenience, resolved lazily (see config.get_settings)
+    if name == "settings":
+        from .config import get_settings
+
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
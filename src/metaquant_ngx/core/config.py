@@ -1,5 +1,14 @@
+from __future__ import annotations
+
+import functools
+
 from pydantic_settings import BaseSettings
 
+# The one Settings definition; import it from here rather than redefining it
+__all__ = ["settings", "Settings", "get_settings"]
+
+ENV_FILE = ".env"
+
 
 class Settings(BaseSettings):
     """Global settings for MetaQuant NGX."""
@@ -18,9 +27,26 @@ class Settings(BaseSettings):
     # Where to store downloaded disclosure PDFs
     NGX_DISCLOSURES_DATA_DIR: str = "data/raw/ngx_disclosures"
 
+    # Concurrent PDF downloads in the disclosure pipeline
+    NGX_PDF_DOWNLOAD_WORKERS: int = 16
+
     class Config:
-        env_file = ".env"
+        env_file = ENV_FILE
         env_file_encoding = "utf-8"
 
 
-settings = Settings()
+@functools.lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Return the process-wide Settings, built (and the .env file read) on the
+    first call.
+    """
+    return Settings()
+
+
+def __getattr__(name: str):
+    # `settings` is built on first access rather than when this module is
+    # imported; library code calls get_settings() where the value is used
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
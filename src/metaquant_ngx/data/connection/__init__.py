@@ -1,3 +1,10 @@
-from .duckdb_connection import get_connection
+from .duckdb_connection import get_connection, open_cursor, transaction
+from .schema import bootstrap_schema, drop_duplicate_keys
 
-__all__ = ["get_connection"]
+__all__ = [
+    "get_connection",
+    "open_cursor",
+    "transaction",
+    "bootstrap_schema",
+    "drop_duplicate_keys",
+]
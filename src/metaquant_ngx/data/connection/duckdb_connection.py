@@ -1,16 +1,116 @@
+from __future__ import annotations
+
+import atexit
+import os
+import threading
 from contextlib import contextmanager
+
 import duckdb
-from ...core.config import settings
+from ...core.config import get_settings
+from .schema import bootstrap_schema
+
+# One long-lived connection per (thread, path); every one ever opened is also
+# tracked globally so the atexit hook can close them all.
+_tls = threading.local()
+_pool_lock = threading.Lock()
+_pool: list[duckdb.DuckDBPyConnection] = []
+
+# Connections (by id) currently inside a ``transaction`` block. DuckDB has
+# no nested transactions, and a failed BEGIN aborts the open one, so inner
+# blocks must know to join the outer transaction instead.
+_open_transactions: set[int] = set()
+
+# Database files whose schema has been bootstrapped in this process.
+# ":memory:" is never added: every in-memory connection is its own database.
+_bootstrapped: set[str] = set()
+_schema_lock = threading.Lock()
+
+
+def _pooled_connection(path: str) -> duckdb.DuckDBPyConnection:
+    cons = getattr(_tls, "cons", None)
+    if cons is None:
+        cons = _tls.cons = {}
+
+    con = cons.get(path)
+    if con is None:
+        con = cons[path] = duckdb.connect(path)
+        _configure(con)
+        with _pool_lock:
+            _pool.append(con)
+        with _schema_lock:
+            if path not in _bootstrapped:
+                bootstrap_schema(con)
+                if path != ":memory:":
+                    _bootstrapped.add(path)
+    return con
+
+
+def _configure(con: duckdb.DuckDBPyConnection) -> None:
+    """Session settings for bulk work, applied once per pooled connection."""
+    # Vectorized scans / INSERT ... SELECT use every core
+    con.execute("SET threads = ?", [os.cpu_count() or 1])
+    # Lets INSERT ... SELECT and COPY run in parallel; queries that need an
+    # order say so with ORDER BY (eod_prices batches are sorted on insert)
+    con.execute("SET preserve_insertion_order = false")
+
+
+def open_cursor(db_path: str | None = None) -> duckdb.DuckDBPyConnection:
+    """
+    Return a new cursor on this thread's pooled connection to ``db_path``,
+    owned by the caller.
+
+    Use this instead of ``get_connection`` for state that must outlive one
+    ``with`` block, e.g. prepared statements, which are bound to the cursor
+    that created them.
+    """
+    return _pooled_connection(db_path or get_settings().DUCKDB_PATH).cursor()
 
 
 @contextmanager
 def get_connection(db_path: str | None = None):
     """
-    Context manager that yields a DuckDB connection and closes it afterwards.
+    Context manager that yields a DuckDB cursor on this thread's pooled
+    connection to ``db_path``.
+
+    The underlying connection is opened once and reused (no re-attach or
+    catalog load per call); the cursor is closed afterwards.
+    """
+    cur = open_cursor(db_path)
+    try:
+        yield cur
+    finally:
+        cur.close()
+
+
+@contextmanager
+def transaction(con: duckdb.DuckDBPyConnection):
+    """
+    Run the block as one transaction on ``con``; roll back if it raises.
+
+    Nested blocks on the same connection join the outermost transaction,
+    which alone commits or rolls back.
     """
-    path = db_path or settings.DUCKDB_PATH
-    con = duckdb.connect(path)
+    key = id(con)
+    if key in _open_transactions:
+        yield con
+        return
+
+    con.begin()
+    _open_transactions.add(key)
     try:
         yield con
+    except BaseException:
+        con.rollback()
+        raise
+    else:
+        con.commit()
     finally:
-        con.close()
+        _open_transactions.discard(key)
+
+
+@atexit.register
+def _close_pool() -> None:
+    with _pool_lock:
+        for con in _pool:
+            con.close()
+        _pool.clear()
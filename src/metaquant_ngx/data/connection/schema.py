@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import duckdb
+
+# Unique key per table as (index name, key columns). ensure_unique_index,
+# drop_duplicate_keys and the repositories' ON CONFLICT targets all use these.
+UNIQUE_KEYS: dict[str, tuple[str, tuple[str, ...]]] = {
+    "eod_prices": ("ux_eod_symbol_date", ("symbol", "date")),
+    # source_url is the company-profile link, shared by all of a company's
+    # filings, so it only identifies a filing together with title and date
+    "corporate_filings": (
+        "ux_cf_filing",
+        ("source_url", "disclosure_title", "disclosure_date"),
+    ),
+}
+
+
+def bootstrap_schema(con: duckdb.DuckDBPyConnection) -> None:
+    """
+    Create every table and index the repositories use, if missing.
+
+    Called once per database when the connection pool first opens it, so
+    repository constructors don't re-issue DDL. Call it yourself for a
+    connection that did not come from ``get_connection``/``open_cursor``.
+    """
+    # Daily OHLCV (PriceRepository)
+    con.execute(
+        """
+        CREATE TABLE IF NOT EXISTS eod_prices (
+            date DATE,
+            open DOUBLE,
+            high DOUBLE,
+            low DOUBLE,
+            close DOUBLE,
+            volume BIGINT,
+            symbol TEXT
+        )
+        """
+    )
+    _unique_index_or_warn(con, "eod_prices")
+    # ART lookups for fetch's symbol IN (...) probe
+    con.execute("CREATE INDEX IF NOT EXISTS idx_eod_symbol ON eod_prices(symbol)")
+
+    # Securities master (SecurityRepository)
+    con.execute(
+        """
+        CREATE TABLE IF NOT EXISTS securities (
+            ticker TEXT PRIMARY KEY,
+            company TEXT,
+            sector TEXT,
+            industry TEXT
+        )
+        """
+    )
+
+    # NGX disclosures (FilingsRepository)
+    con.execute(
+        """
+        CREATE TABLE IF NOT EXISTS corporate_filings (
+            company_name TEXT,
+            symbol TEXT,
+            disclosure_title TEXT,
+            disclosure_type TEXT,
+            disclosure_date DATE,
+            source_url TEXT,
+            pdf_url TEXT,
+            local_pdf_path TEXT
+        )
+        """
+    )
+    # Superseded: allowed one filing per company (see UNIQUE_KEYS)
+    con.execute("DROP INDEX IF EXISTS ix_cf_source_url")
+    _unique_index_or_warn(con, "corporate_filings")
+
+
+def _unique_index_or_warn(con: duckdb.DuckDBPyConnection, table: str) -> None:
+    # Duplicates in one table must not break connections used only for the
+    # others; the upsert that needs the index raises the error instead
+    try:
+        ensure_unique_index(con, table)
+    except RuntimeError as exc:
+        print(f"Warning: {exc} Upserts into {table} fail until then.")
+
+
+def ensure_unique_index(con: duckdb.DuckDBPyConnection, table: str) -> None:
+    """
+    Create ``table``'s unique index (see ``UNIQUE_KEYS``) if it does not exist.
+
+    Tables written before the index existed may already hold duplicate keys.
+    Nothing is deleted here: the index is not created and a RuntimeError
+    names the duplicates; remove them with ``drop_duplicate_keys`` first.
+    """
+    index, columns = UNIQUE_KEYS[table]
+    exists = con.execute(
+        "SELECT count(*) FROM duckdb_indexes() WHERE table_name = ? AND index_name = ?",
+        [table, index],
+    ).fetchone()[0]
+    if exists:
+        return
+
+    key = ", ".join(columns)
+    not_null = " AND ".join(f"{c} IS NOT NULL" for c in columns)
+    dupes = con.execute(
+        f"""
+        SELECT {key}, count(*) AS n
+        FROM {table}
+        WHERE {not_null}
+        GROUP BY ALL
+        HAVING count(*) > 1
+        ORDER BY n DESC
+        """
+    ).fetchall()
+    if dupes:
+        sample = ", ".join(str(row[:-1]) for row in dupes[:5])
+        raise RuntimeError(
+            f"Cannot create unique index {index}: {table} has {len(dupes)} duplicate "
+            f"({key}) keys, e.g. {sample}. Remove them with "
+            f"drop_duplicate_keys(con, {table!r})."
+        )
+
+    con.execute(f"CREATE UNIQUE INDEX {index} ON {table}({key})")
+
+
+def drop_duplicate_keys(con: duckdb.DuckDBPyConnection, table: str) -> int:
+    """
+    One-off migration: delete all but the most recently inserted row (highest
+    rowid) of each duplicated non-null key of ``table`` (see ``UNIQUE_KEYS``),
+    then build its unique index. The latest copy is kept so re-ingested
+    corrections survive.
+
+    Returns the number of rows removed.
+    """
+    _, columns = UNIQUE_KEYS[table]
+    key = ", ".join(columns)
+    not_null = " AND ".join(f"{c} IS NOT NULL" for c in columns)
+    removed = con.execute(
+        f"""
+        DELETE FROM {table}
+        WHERE {not_null}
+          AND rowid NOT IN (SELECT max(rowid) FROM {table} GROUP BY {key})
+        """
+    ).fetchone()[0]
+    print(f"Removed {removed} duplicate ({key}) rows from {table}.")
+    ensure_unique_index(con, table)
+    return removed
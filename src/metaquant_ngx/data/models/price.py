@@ -1,7 +1,14 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
 from datetime import datetime
+from typing import TYPE_CHECKING, Sequence
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PriceBar:
     symbol: str
     date: datetime
@@ -12,3 +19,21 @@ class PriceBar:
     volume: int
     value_traded: float | None = None
     n_trades: int | None = None
+
+    @classmethod
+    def to_record_batch(cls, bars: Sequence[PriceBar]) -> pa.RecordBatch:
+        """Pack bars column-wise into an Arrow batch laid out like eod_prices."""
+        import pyarrow as pa
+
+        return pa.RecordBatch.from_arrays(
+            [
+                pa.array([b.date for b in bars], type=pa.date32()),
+                pa.array([b.open for b in bars], type=pa.float64()),
+                pa.array([b.high for b in bars], type=pa.float64()),
+                pa.array([b.low for b in bars], type=pa.float64()),
+                pa.array([b.close for b in bars], type=pa.float64()),
+                pa.array([b.volume for b in bars], type=pa.int64()),
+                pa.array([b.symbol for b in bars], type=pa.string()),
+            ],
+            names=["date", "open", "high", "low", "close", "volume", "symbol"],
+        )
@@ -1,4 +1,28 @@
-from .ngx_eod_provider import NgxEodProvider
-from .ngx_disclosure_provider import NgxDisclosureProvider
+from __future__ import annotations
 
-__all__ = ["NgxEodProvider", "NgxDisclosureProvider"]
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .ngx_disclosure_async_provider import NgxDisclosureAsyncProvider
+    from .ngx_disclosure_provider import NgxDisclosureProvider
+    from .ngx_eod_provider import NgxEodProvider
+
+# Resolved on first attribute access (PEP 562) so e.g. the EOD script does not
+# import requests/lxml for the disclosure scraper.
+_LAZY = {
+    "NgxEodProvider": ".ngx_eod_provider",
+    "NgxDisclosureProvider": ".ngx_disclosure_provider",
+    "NgxDisclosureAsyncProvider": ".ngx_disclosure_async_provider",
+}
+
+__all__ = ["NgxEodProvider", "NgxDisclosureProvider", "NgxDisclosureAsyncProvider"]
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
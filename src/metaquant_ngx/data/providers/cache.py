@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+
+def write_parquet_atomic(df: pd.DataFrame | pa.Table, dest: Path) -> bool:
+    """
+    Write ``df`` (a DataFrame or Arrow table) to ``dest`` as zstd Parquet via
+    a temp file + ``os.replace``, so readers never see a half-written sidecar.
+
+    Returns False (and leaves nothing behind) if the directory is not writable;
+    callers treat the cache as best-effort.
+    """
+    tmp = dest.with_name(f"{dest.name}.{os.getpid()}.tmp")
+    try:
+        if hasattr(df, "to_parquet"):
+            df.to_parquet(tmp, compression="zstd", index=False)
+        else:
+            import pyarrow.parquet as pq
+
+            pq.write_table(df, tmp, compression="zstd")
+        os.replace(tmp, dest)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        return False
+    return True
+
+
+def write_bytes_atomic(dest: Path, data: bytes) -> None:
+    """
+    Write ``data`` to ``dest`` via a temp file + ``os.replace``: an interrupted
+    write never leaves a truncated ``dest``, and concurrent writers of the same
+    file each replace it whole.
+    """
+    # per thread as well as per process: downloads run on thread pools
+    tmp = dest.with_name(f"{dest.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, dest)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def evict_siblings(keep: Path, pattern: str) -> None:
+    """Remove files in ``keep.parent`` matching ``pattern`` other than ``keep``."""
+    for stale in keep.parent.glob(pattern):
+        if stale != keep:
+            stale.unlink(missing_ok=True)
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+
+import pandas as pd
+
+from .cache import write_bytes_atomic
+from .ngx_disclosure_playwright_provider import (
+    BLOCKED_RESOURCE_TYPES,
+    BROWSER_VIEWPORT,
+    NgxDisclosurePlaywrightProvider,
+)
+from .pdf_download import pdf_path
+
+
+class NgxDisclosureAsyncProvider(NgxDisclosurePlaywrightProvider):
+    """
+    Async sibling of NgxDisclosurePlaywrightProvider.
+
+    Renders the disclosures page with async Playwright, then downloads every
+    row's PDF concurrently through the browser context's APIRequestContext
+    (at most ``max_concurrency`` in flight) and fills ``local_pdf_path``.
+
+    ``fetch_page()`` wraps ``afetch_page()`` with ``asyncio.run`` for
+    synchronous callers; each call launches its own browser. To keep one
+    Chromium warm across several ``afetch_page()`` calls, use the provider
+    as an async context manager (``async with``). The inherited sync
+    ``with`` block starts no browser.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        use_cache: bool = True,
+        max_concurrency: int = 8,
+    ) -> None:
+        super().__init__(base_url=base_url, use_cache=use_cache)
+        self.max_concurrency = max_concurrency
+        self._apw = None
+        self._abrowser = None
+        self._actx = None
+
+    def __enter__(self) -> NgxDisclosureAsyncProvider:
+        # Each fetch_page() runs its own event loop, so there is no sync
+        # browser to keep warm; don't launch the parent's
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    async def __aenter__(self) -> NgxDisclosureAsyncProvider:
+        # imported here so callers that never launch a browser skip the cost
+        from playwright.async_api import async_playwright
+
+        try:
+            self._apw = await async_playwright().start()
+            self._abrowser = await self._apw.chromium.launch(headless=True)
+            self._actx = await self._abrowser.new_context(viewport=BROWSER_VIEWPORT)
+            await self._actx.route("**/*", _block_assets)
+        except BaseException:
+            await self.aclose()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Shut down the async browser and Playwright driver, if running."""
+        if self._abrowser is not None:
+            await self._abrowser.close()
+        if self._apw is not None:
+            await self._apw.stop()
+        self._apw = self._abrowser = self._actx = None
+
+    def fetch_page(self) -> pd.DataFrame:
+        """Blocking wrapper around ``afetch_page``."""
+        return asyncio.run(self.afetch_page())
+
+    async def afetch_page(self) -> pd.DataFrame:
+        """Load page via Chromium, parse the table and download its PDFs."""
+        if self._actx is None:
+            async with self:
+                return await self.afetch_page()
+
+        page = await self._actx.new_page()
+        try:
+            await page.goto(self.base_url, wait_until="domcontentloaded")
+            await page.wait_for_selector("table")
+            html = await page.content()
+        finally:
+            await page.close()
+
+        df = self._parse_cached(html)
+        if not df.empty:
+            df["local_pdf_path"] = await self._download_pdfs(self._actx, df["pdf_url"])
+        return df
+
+    async def _download_pdfs(self, ctx, pdf_urls: pd.Series) -> list[str | None]:
+        """Download each distinct URL once; return local paths aligned with ``pdf_urls``."""
+        dest_dir = self.data_dir  # created in __init__
+        sem = asyncio.Semaphore(self.max_concurrency)
+
+        async def download(url: str) -> str | None:
+            # same file name as download_pdf, so the providers share PDFs
+            dest = pdf_path(url, dest_dir)
+            if dest.exists():
+                return str(dest)
+
+            async with sem:
+                try:
+                    resp = await ctx.request.get(url, timeout=60_000)
+                    if not resp.ok:
+                        print(f"Debug: PDF download failed ({resp.status}) for {url}")
+                        return None
+                    body = await resp.body()
+                except Exception as exc:  # playwright raises its own Error type
+                    print(f"Debug: PDF download failed for {url}: {exc}")
+                    return None
+
+            await asyncio.to_thread(write_bytes_atomic, dest, body)
+            return str(dest)
+
+        urls = [u for u in pdf_urls.dropna().unique() if u]
+        paths = dict(zip(urls, await asyncio.gather(*(download(u) for u in urls))))
+        return [paths.get(u) for u in pdf_urls]
+
+
+async def _block_assets(route) -> None:
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
@@ -1,53 +1,122 @@
 from __future__ import annotations
 
-from datetime import datetime, date
+import hashlib
+import io
 from pathlib import Path
 from typing import Optional
 from urllib.parse import urljoin
 
+import lxml.html
 import pandas as pd
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
+from lxml import etree
 
-from ...core.config import settings
+from ...core.config import get_settings
+from .cache import evict_siblings, write_parquet_atomic
+from .pdf_download import download_pdf
+
+# Only the table HTML matters; don't fetch assets that can't affect it
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "stylesheet", "font", "media"})
+BROWSER_VIEWPORT = {"width": 1280, "height": 800}
+
+# Data rows (anything after a table's first row) with a cell spanning columns
+_SPANNED_ROWS = etree.XPath("//table/descendant::tr[position() > 1][td[@colspan > 1]]")
 
 
 class NgxDisclosurePlaywrightProvider:
     """
     Uses Playwright (real browser) to load the NGX corporate disclosures page
     so we can see JS-rendered tables.
+
+    Parsed tables are cached as Parquet keyed by a hash of the rendered HTML,
+    so an unchanged page is not re-parsed.
+
+    Use it as a context manager to keep one Chromium instance warm across
+    several ``fetch_page()`` calls; outside a ``with`` block each call
+    launches (and tears down) its own browser.
     """
 
-    def __init__(self, base_url: str | None = None) -> None:
+    def __init__(self, base_url: str | None = None, use_cache: bool = True) -> None:
+        settings = get_settings()
         self.base_url = base_url or settings.NGX_CORP_DISCLOSURES_URL
+        self.use_cache = use_cache
+        self.data_dir = Path(settings.NGX_DISCLOSURES_DATA_DIR)
+        self._cache_dir = self.data_dir / ".cache"
+        # created once here rather than on every cache write / download
+        (self._cache_dir if use_cache else self.data_dir).mkdir(parents=True, exist_ok=True)
+        self._pw = None
+        self._browser = None
+        self._ctx = None
+
+    def __enter__(self) -> NgxDisclosurePlaywrightProvider:
+        # imported here so callers that never launch a browser skip the cost
+        from playwright.sync_api import sync_playwright
+
+        try:
+            self._pw = sync_playwright().start()
+            self._browser = self._pw.chromium.launch(headless=True)
+            self._ctx = self._browser.new_context(viewport=BROWSER_VIEWPORT)
+            self._ctx.route("**/*", _block_assets)
+        except BaseException:
+            self.close()
+            raise
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the browser and Playwright driver, if running."""
+        if self._browser is not None:
+            self._browser.close()
+        if self._pw is not None:
+            self._pw.stop()
+        self._pw = self._browser = self._ctx = None
 
     def fetch_page(self) -> pd.DataFrame:
         """Load page via Chromium, parse disclosures table into a DataFrame."""
-        html = self._fetch_html_via_browser()
-        soup = BeautifulSoup(html, "lxml")
-
-        tables = soup.find_all("table")
-        if not tables:
+        return self._parse_cached(self._fetch_html_via_browser())
+
+    def _parse_cached(self, html: str) -> pd.DataFrame:
+        """Parse ``html``, or load the table cached for identical HTML."""
+        cache_path = self._cache_path(html) if self.use_cache else None
+        if cache_path is not None and cache_path.exists():
+            return pd.read_parquet(cache_path)
+
+        df = self._parse_html(html)
+        if cache_path is not None and not df.empty and write_parquet_atomic(df, cache_path):
+            evict_siblings(cache_path, "*.parquet")
+        return df
+
+    def _cache_path(self, html: str) -> Path:
+        """Sidecar path keyed by the page content (and base_url, used for links)."""
+        digest = hashlib.sha256(f"{self.base_url}\n{html}".encode("utf-8")).hexdigest()
+        return self._cache_dir / f"{digest}.parquet"
+
+    def _parse_html(self, html: str) -> pd.DataFrame:
+        """Parse the disclosures table out of rendered HTML."""
+        if "colspan" in html:
+            html = self._drop_spanned_rows(html)
+
+        try:
+            # lxml-backed parse straight into DataFrames; body cells come back
+            # as (text, href) tuples so we keep the links.
+            tables = pd.read_html(io.StringIO(html), flavor="lxml", extract_links="body")
+        except ValueError:
             print("Debug: no <table> tags found in rendered HTML.")
             return pd.DataFrame()
 
         # Find the table whose headers look like "Company | Disclosures | Date Submitted"
         disclosures_table = None
         for t in tables:
-            header_row = t.find("tr")
-            if not header_row:
-                continue
-
-            header_cells = [
-                th.get_text(strip=True).lower()
-                for th in header_row.find_all(["th", "td"])
-            ]
-            if not header_cells:
-                continue
-
-            has_company = any("company" in h or "issuer" in h for h in header_cells)
-            has_disclosures = any("disclosure" in h or "headline" in h or "subject" in h for h in header_cells)
-            has_date = any("date" in h for h in header_cells)
+            if not t.empty and pd.api.types.is_integer_dtype(t.columns):
+                # No <th> header row: read_html numbers the columns, and the
+                # header <td> cells come back as the first body row.
+                labels = [c[0] if isinstance(c, tuple) else c for c in t.iloc[0]]
+                t = t.iloc[1:].reset_index(drop=True).set_axis(labels, axis=1)
+            header = pd.Index(t.columns.astype(str)).str.lower()
+            has_company = header.str.contains("company|issuer").any()
+            has_disclosures = header.str.contains("disclosure|headline|subject").any()
+            has_date = header.str.contains("date").any()
 
             if has_company and (has_disclosures or has_date):
                 disclosures_table = t
@@ -57,95 +126,118 @@ class NgxDisclosurePlaywrightProvider:
             print("Debug: could not find disclosures table based on headers.")
             return pd.DataFrame()
 
-        rows = disclosures_table.find_all("tr")
-        if len(rows) <= 1:
+        if disclosures_table.empty:
             print("Debug: disclosures table has no data rows.")
             return pd.DataFrame()
 
-        header_cells = [
-            th.get_text(strip=True).lower()
-            for th in rows[0].find_all(["th", "td"])
-        ]
+        header = pd.Index(disclosures_table.columns.astype(str)).str.lower()
 
-        def find_idx(candidates: list[str]) -> Optional[int]:
+        def text_of(candidates: list[str]) -> pd.Series:
             for cand in candidates:
-                for idx, name in enumerate(header_cells):
-                    if cand in name:
-                        return idx
-            return None
-
-        issuer_idx = find_idx(["issuer", "company", "security"])
-        title_idx = find_idx(["disclosure", "title", "headline", "subject", "description"])
-        date_idx = find_idx(["date", "submitted", "released"])
-        type_idx = find_idx(["category", "type", "segment", "classification"])
-
-        data = []
-        for row in rows[1:]:
-            cells = row.find_all("td")
-            if not cells:
-                continue
-
-            def safe_get(idx: Optional[int]) -> str:
-                if idx is None or idx >= len(cells):
-                    return ""
-                return cells[idx].get_text(strip=True)
-
-            company_name = safe_get(issuer_idx)
-            title = safe_get(title_idx)
-            disclosure_type = safe_get(type_idx) or None
-            date_text = safe_get(date_idx)
-            disclosure_date = self._parse_date(date_text)
-
-            link = row.find("a", href=True)
-            source_url = urljoin(self.base_url, link["href"]) if link else None
-
-            pdf_url = None
-            if source_url and source_url.lower().endswith(".pdf"):
-                pdf_url = source_url
-
-            data.append(
-                {
-                    "company_name": company_name or None,
-                    "symbol": None,  # we'll map later
-                    "disclosure_title": title or None,
-                    "disclosure_type": disclosure_type,
-                    "disclosure_date": disclosure_date,
-                    "source_url": source_url,
-                    "pdf_url": pdf_url,
-                    "local_pdf_path": None,
-                }
+                hits = header.str.contains(cand, regex=False)
+                if hits.any():
+                    return disclosures_table.iloc[:, hits.argmax()].map(_cell_text)
+            return pd.Series(
+                [None] * len(disclosures_table), index=disclosures_table.index, dtype=object
             )
 
-        df = pd.DataFrame(data)
-        df = df[df["disclosure_title"].notna()]  # keep only real rows
+        title = text_of(["disclosure", "title", "headline", "subject", "description"])
+
+        # Keep only real rows, before the other columns are extracted/parsed
+        has_title = title.notna().to_numpy()
+        if not has_title.all():
+            disclosures_table = disclosures_table[has_title].reset_index(drop=True)
+            title = title[has_title].reset_index(drop=True)
+
+        company_name = text_of(["issuer", "company", "security"])
+        date_text = text_of(["date", "submitted", "released"])
+        disclosure_type = text_of(["category", "type", "segment", "classification"])
+
+        # First link in each row, scanning cells left to right
+        hrefs = disclosures_table.apply(lambda col: col.map(_cell_href)).bfill(axis=1).iloc[:, 0]
+        source_url = pd.Series(
+            [urljoin(self.base_url, h) if isinstance(h, str) and h else None for h in hrefs],
+            index=disclosures_table.index,
+            dtype=object,
+        )
+        is_pdf = source_url.str.lower().str.endswith(".pdf", na=False)
+        pdf_url = source_url.where(is_pdf, None)
+
+        df = pd.DataFrame(
+            {
+                "company_name": company_name,
+                "symbol": None,  # we'll map later
+                "disclosure_title": title,
+                "disclosure_type": disclosure_type,
+                "disclosure_date": self._parse_dates(date_text),
+                "source_url": source_url,
+                "pdf_url": pdf_url,
+                "local_pdf_path": None,
+            }
+        )
         print(f"Debug: parsed {len(df)} disclosure rows from rendered HTML.")
-        return df.reset_index(drop=True)
+        return df
+
+    @staticmethod
+    def _drop_spanned_rows(html: str) -> str:
+        """
+        Remove data rows containing a ``colspan`` cell ("No more data" and
+        similar placeholders). read_html would copy the spanned text into
+        every column it covers, turning the placeholder into a fake filing.
+        """
+        doc = lxml.html.fromstring(html)
+        spanned = _SPANNED_ROWS(doc)
+        if not spanned:
+            return html
+        for tr in spanned:
+            tr.getparent().remove(tr)
+        return lxml.html.tostring(doc, encoding="unicode")
 
     def _fetch_html_via_browser(self) -> str:
         """Use Playwright Chromium to render the page and return HTML."""
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            page.goto(self.base_url, wait_until="networkidle")
-            html = page.content()
-            browser.close()
-        return html
+        if self._ctx is None:
+            with self:
+                return self._fetch_html_via_browser()
+
+        page = self._ctx.new_page()
+        try:
+            # "networkidle" waits out every trailing request; the table is all we need
+            page.goto(self.base_url, wait_until="domcontentloaded")
+            page.wait_for_selector("table")
+            return page.content()
+        finally:
+            page.close()
+
+    def download_pdf(self, pdf_url: str, dest_dir: Path) -> Optional[Path]:
+        """Download a PDF if pdf_url is non-empty; return local Path or None."""
+        # Plain HTTP GET; the browser is only needed for the JS-rendered page
+        return download_pdf(pdf_url, dest_dir)
 
     @staticmethod
-    def _parse_date(text: str) -> Optional[date]:
-        if not text:
-            return None
-        text = text.strip()
-        formats = [
-            "%d-%b-%Y",
-            "%d %b %Y",
-            "%b %d, %Y",
-            "%Y-%m-%d",
-            "%d/%m/%Y",
-        ]
-        for fmt in formats:
-            try:
-                return datetime.strptime(text, fmt).date()
-            except ValueError:
-                continue
-        return None
+    def _parse_dates(text: pd.Series) -> pd.Series:
+        """Vectorized date parse; unparseable cells become None."""
+        # ISO first: dayfirst=True would otherwise swap month/day on "YYYY-MM-DD"
+        parsed = pd.to_datetime(text, format="ISO8601", errors="coerce")
+        rest = parsed.isna() & text.notna()
+        if rest.any():
+            parsed[rest] = pd.to_datetime(
+                text[rest], format="mixed", dayfirst=True, errors="coerce"
+            )
+        return parsed.dt.date.where(parsed.notna(), None)
+
+
+# read_html cells are (text, href) tuples, or float NaN where a row has no
+# cell in that column (a column no row reaches is all NaN)
+def _cell_text(cell) -> Optional[str]:
+    return (cell[0].strip() or None) if isinstance(cell, tuple) and cell[0] else None
+
+
+def _cell_href(cell) -> Optional[str]:
+    return cell[1] if isinstance(cell, tuple) else None
+
+
+def _block_assets(route) -> None:
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+import functools
+import re
 from datetime import datetime, date
 from pathlib import Path
 from typing import Optional
 from urllib.parse import urljoin
 
+import lxml.html
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
 
-from ...core.config import settings
+from ...core.config import get_settings
+from .pdf_download import download_pdf
 
 # Pretend to be a normal browser to avoid 403
 DEFAULT_HEADERS = {
@@ -26,6 +30,33 @@ DEFAULT_HEADERS = {
     "Referer": "https://ngxgroup.com/",
 }
 
+# Date shapes seen on NGX, classified once so each cell needs a single strptime
+_DATE_SHAPE_RE = re.compile(
+    r"^(?:(?P<iso>\d{4}-\d{1,2}-\d{1,2})"
+    r"|(?P<dmon_dash>\d{1,2}-[A-Za-z]{3}-\d{4})"
+    r"|(?P<dmon_space>\d{1,2} [A-Za-z]{3} \d{4})"
+    r"|(?P<mon_dy>[A-Za-z]{3} \d{1,2}, \d{4})"
+    r"|(?P<dmy>\d{1,2}/\d{1,2}/\d{4}))$"
+)
+_DATE_FORMATS = {
+    "iso": "%Y-%m-%d",
+    "dmon_dash": "%d-%b-%Y",
+    "dmon_space": "%d %b %Y",
+    "mon_dy": "%b %d, %Y",
+    "dmy": "%d/%m/%Y",
+}
+
+# Header cells of a table's first row, and the first link in a row
+_HEADER_CELLS = etree.XPath("(.//tr)[1]/*[self::th or self::td]")
+_FIRST_HREF = etree.XPath("string((.//a[@href])[1]/@href)")
+
+
+@functools.lru_cache(maxsize=None)
+def _cell_text(idx: int) -> etree.XPath:
+    """Compiled XPath for the text of a row's ``idx``-th <td> ("" if absent)."""
+    return etree.XPath(f"string(td[{idx + 1}])")
+
+
 class NgxDisclosureProvider:
     """
     Scrapes NGX corporate disclosures page and returns a DataFrame.
@@ -42,7 +73,10 @@ class NgxDisclosureProvider:
     """
 
     def __init__(self, base_url: str | None = None) -> None:
+        settings = get_settings()
         self.base_url = base_url or settings.NGX_CORP_DISCLOSURES_URL
+        self.data_dir = Path(settings.NGX_DISCLOSURES_DATA_DIR)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
 
     def fetch_page(self) -> pd.DataFrame:
         """Fetch and parse the corporate disclosures table."""
@@ -55,24 +89,21 @@ class NgxDisclosureProvider:
             )
         resp.raise_for_status()
 
-        soup = BeautifulSoup(resp.text, "lxml")
+        doc = lxml.html.fromstring(resp.text)
 
         # Find all tables and pick the one whose header looks like:
         # "Company | Disclosures | Date Submitted"
-        tables = soup.find_all("table")
+        tables = doc.xpath("//table")
         if not tables:
             raise RuntimeError("No <table> elements found on NGX disclosures page.")
 
         disclosures_table = None
         for table in tables:
-            header_row = table.find("tr")
-            if not header_row:
+            header_cells = _HEADER_CELLS(table)
+            if not header_cells:
                 continue
 
-            header_cells = [
-                th.get_text(strip=True).lower()
-                for th in header_row.find_all(["th", "td"])
-            ]
+            header_cells = [h.text_content().strip().lower() for h in header_cells]
 
             # Heuristic: must contain at least "company" and "disclosures" or "date"
             has_company = any("company" in h for h in header_cells)
@@ -90,13 +121,8 @@ class NgxDisclosureProvider:
             )
 
         # Now parse that specific table
-        rows = disclosures_table.find_all("tr")
-        if len(rows) <= 1:
-            return pd.DataFrame()
-
         header_cells = [
-            th.get_text(strip=True).lower()
-            for th in rows[0].find_all(["th", "td"])
+            h.text_content().strip().lower() for h in _HEADER_CELLS(disclosures_table)
         ]
 
         def find_idx(candidates: list[str]) -> Optional[int]:
@@ -111,91 +137,63 @@ class NgxDisclosureProvider:
         date_idx = find_idx(["date", "submitted", "released"])
         type_idx = find_idx(["category", "type", "segment", "classification"])
 
-        data = []
-        for row in rows[1:]:
-            cells = row.find_all("td")
-            if not cells:
-                continue
-
-            def safe_get(idx: Optional[int]) -> str:
-                if idx is None or idx >= len(cells):
-                    return ""
-                return cells[idx].get_text(strip=True)
-
-            company_name = safe_get(issuer_idx)
-            title = safe_get(title_idx)
-            disclosure_type = safe_get(type_idx) or None
-            date_text = safe_get(date_idx)
-            disclosure_date = self._parse_date(date_text)
-
-            link = row.find("a", href=True)
-            source_url = urljoin(self.base_url, link["href"]) if link else None
-
-            pdf_url = None
-            if source_url and source_url.lower().endswith(".pdf"):
-                pdf_url = source_url
-
-            data.append(
-                {
-                    "company_name": company_name or None,
-                    "symbol": None,  # to be mapped later
-                    "disclosure_title": title or None,
-                    "disclosure_type": disclosure_type,
-                    "disclosure_date": disclosure_date,
-                    "source_url": source_url,
-                    "pdf_url": pdf_url,
-                    "local_pdf_path": None,
-                }
-            )
-
-        df = pd.DataFrame(data)
+        # Only the title cell is required; rows missing a trailing cell (e.g.
+        # no "type") are kept with that column empty.
+        if title_idx is None:
+            return pd.DataFrame()
+        rows = disclosures_table.xpath(f"(.//tr)[position() > 1][count(td) > {title_idx}]")
+
+        # Keep only rows with some useful content, decided before any other
+        # cell is read. Don't strictly require source_url – some rows may
+        # not have a link.
+        title_of = _cell_text(title_idx)
+        titles = [title_of(row).strip() for row in rows]
+        keep = [i for i, t in enumerate(titles) if t]
+        if not keep:
+            return pd.DataFrame()
 
-        # Keep only rows with some useful content
-        if not df.empty:
-            df = df[df["disclosure_title"].notna()]
-            # Don't strictly require source_url – some rows may not have a link
-            # df = df[df["source_url"].notna()]
+        def column(idx: Optional[int]) -> list[str]:
+            if idx is None:
+                return [""] * len(keep)
+            # string() of a missing cell is "", so short rows stay aligned
+            text_of = _cell_text(idx)
+            return [text_of(rows[i]).strip() for i in keep]
 
-        return df.reset_index(drop=True)
+        source_urls = [
+            urljoin(self.base_url, href) if href else None
+            for href in (_FIRST_HREF(rows[i]) for i in keep)
+        ]
 
+        # Built once from the kept rows, so already 0..n-1 indexed
+        return pd.DataFrame(
+            {
+                "company_name": [c or None for c in column(issuer_idx)],
+                "symbol": None,  # to be mapped later
+                "disclosure_title": [titles[i] for i in keep],
+                "disclosure_type": [t or None for t in column(type_idx)],
+                "disclosure_date": [self._parse_date(t) for t in column(date_idx)],
+                "source_url": source_urls,
+                "pdf_url": [
+                    u if u and u.lower().endswith(".pdf") else None for u in source_urls
+                ],
+                "local_pdf_path": None,
+            }
+        )
 
     @staticmethod
     def _parse_date(text: str) -> Optional[date]:
-        """Try several date formats used on NGX; return None if parsing fails."""
+        """Parse the date formats used on NGX; return None if parsing fails."""
         if not text:
             return None
 
-        text = text.strip()
-        formats = [
-            "%d-%b-%Y",
-            "%d %b %Y",
-            "%b %d, %Y",
-            "%Y-%m-%d",
-            "%d/%m/%Y",
-        ]
-        for fmt in formats:
-            try:
-                return datetime.strptime(text, fmt).date()
-            except ValueError:
-                continue
-        return None
+        match = _DATE_SHAPE_RE.match(text.strip())
+        if match is None:
+            return None
+        try:
+            return datetime.strptime(match.group(), _DATE_FORMATS[match.lastgroup]).date()
+        except ValueError:  # right shape, impossible date (e.g. 31-Feb-2025)
+            return None
 
     def download_pdf(self, pdf_url: str, dest_dir: Path) -> Optional[Path]:
         """Download a PDF if pdf_url is non-empty; return local Path or None."""
-        if not pdf_url:
-            return None
-
-        dest_dir.mkdir(parents=True, exist_ok=True)
-
-        filename = pdf_url.split("/")[-1].split("?")[0] or "filing.pdf"
-        dest_path = dest_dir / filename
-
-        if dest_path.exists():
-            return dest_path
-
-        resp = requests.get(pdf_url, timeout=60)
-        resp.raise_for_status()
-        with open(dest_path, "wb") as f:
-            f.write(resp.content)
-
-        return dest_path
+        return download_pdf(pdf_url, dest_dir)
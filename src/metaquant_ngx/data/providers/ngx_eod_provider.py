@@ -1,8 +1,20 @@
 from __future__ import annotations
 
+import glob
 from pathlib import Path
 from datetime import date
-import pandas as pd
+from typing import TYPE_CHECKING, ClassVar
+
+from ..connection import get_connection
+from .cache import evict_siblings, write_parquet_atomic
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+# Non-ISO date layouts seen in NGX files, tried (as a DuckDB strptime format
+# list) after a plain DATE cast fails
+_NGX_DATE_FORMATS = "['%d-%b-%Y', '%d %b %Y', '%b %d, %Y', '%d/%m/%Y']"
 
 
 class NgxEodProvider:
@@ -12,67 +24,146 @@ class NgxEodProvider:
     This is intentionally simple to start with; you can later extend it to:
     - Download from NGX directly
     - Parse PDFs instead of CSV/XLSX
+
+    Normalized results are cached next to the source file as a Parquet
+    sidecar keyed by the file's mtime/size, so re-loading an unchanged
+    file skips the CSV/XLSX parse entirely.
     """
 
+    # Accepted (lowercase) headers per standard column, most preferred first.
+    # Adjust this once you see the actual NGX file headers.
+    _SYNONYMS: ClassVar[dict[str, tuple[str, ...]]] = {
+        "symbol": ("symbol", "ticker"),
+        "open": ("open",),
+        "high": ("high",),
+        "low": ("low",),
+        "close": ("close", "price", "last"),
+        "volume": ("volume", "vol"),
+        "date": ("date",),
+    }
+    _REQUIRED: ClassVar[tuple[str, ...]] = ("symbol", "open", "high", "low", "close", "volume")
+
+    # header -> (standard column, preference rank), built once from _SYNONYMS
+    _HEADER_LOOKUP: ClassVar[dict[str, tuple[str, int]]] = {
+        syn: (std, rank) for std, syns in _SYNONYMS.items() for rank, syn in enumerate(syns)
+    }
+
+    def __init__(self, use_cache: bool = True) -> None:
+        self.use_cache = use_cache
+
     def load_file(self, path: str | Path, trading_date: date | None = None) -> pd.DataFrame:
+        """``load_table`` as an Arrow-backed DataFrame."""
+        import pandas as pd
+
+        return self.load_table(path, trading_date).to_pandas(types_mapper=pd.ArrowDtype)
+
+    def load_table(self, path: str | Path, trading_date: date | None = None) -> pa.Table:
+        """Load and normalize one EOD file as an Arrow table (no pandas for CSV)."""
+        import pyarrow.parquet as pq
+
         path = Path(path)
         if not path.exists():
             raise FileNotFoundError(path)
 
+        cache_path = self._cache_path(path, trading_date) if self.use_cache else None
+        if cache_path is not None and cache_path.exists():
+            return pq.read_table(cache_path)
+
+        # XLSX: calamine (Rust) into Arrow-backed columns. CSV: no Python-side
+        # parse at all; DuckDB's multithreaded reader scans the file inside
+        # the normalizing projection.
         if path.suffix.lower() in {".xlsx", ".xls"}:
-            raw = pd.read_excel(path, engine="openpyxl")
+            import pandas as pd
+
+            raw = pd.read_excel(path, engine="calamine", dtype_backend="pyarrow")
         else:
-            raw = pd.read_csv(path)
-
-        df = self._normalize_columns(raw, trading_date)
-        return df
-
-    def _normalize_columns(self, raw: pd.DataFrame, trading_date) -> pd.DataFrame:
-        cols_lower = {c.lower(): c for c in raw.columns}
-
-        # Try to guess columns – adjust this once you see the actual NGX file headers
-        symbol_col = cols_lower.get("symbol") or cols_lower.get("ticker")
-        open_col = cols_lower.get("open")
-        high_col = cols_lower.get("high")
-        low_col = cols_lower.get("low")
-        close_col = (
-            cols_lower.get("close")
-            or cols_lower.get("price")
-            or cols_lower.get("last")
-        )
-        volume_col = cols_lower.get("volume") or cols_lower.get("vol")
-
-        missing = [
-            name
-            for name, col in [
-                ("symbol", symbol_col),
-                ("open", open_col),
-                ("high", high_col),
-                ("low", low_col),
-                ("close", close_col),
-                ("volume", volume_col),
-            ]
-            if col is None
-        ]
+            raw = path
+
+        table = self._normalize_columns(raw, trading_date)
+
+        if cache_path is not None and write_parquet_atomic(table, cache_path):
+            evict_siblings(cache_path, f"{glob.escape(path.name)}.*.parquet")
+        return table
+
+    @staticmethod
+    def _cache_path(path: Path, trading_date: date | None = None) -> Path:
+        """Sidecar path for ``path``; changes whenever the source file does."""
+        st = path.stat()
+        key = f"{st.st_mtime_ns}-{st.st_size}"
+        if trading_date is not None:
+            key += f"-{trading_date:%Y%m%d}"
+        return path.with_name(f"{path.name}.{key}.parquet")
+
+    def _normalize_columns(self, raw: pd.DataFrame | Path, trading_date) -> pa.Table:
+        with get_connection(":memory:") as con:
+            if isinstance(raw, Path):
+                # Only the header/types are sniffed here; rows are read once,
+                # by the query below
+                source = con.read_csv(str(raw), header=True)
+                source.create_view("raw")
+                headers = source.columns
+            else:
+                con.register("raw", raw)
+                headers = raw.columns
+
+            query, params = self._projection(headers, trading_date)
+
+            # Arrow result: `date` stays date32 (no datetime64/object
+            # round-trip) all the way into the repository.
+            return con.execute(query, params).fetch_arrow_table()
+
+    def _projection(self, headers, trading_date) -> tuple[str, list]:
+        """SELECT over ``raw`` that renames, cleans and casts to eod_prices."""
+        # Single pass over the headers, keeping the most preferred synonym
+        resolved: dict[str, str] = {}
+        ranks: dict[str, int] = {}
+        for col in headers:
+            hit = self._HEADER_LOOKUP.get(str(col).lower())
+            if hit is None:
+                continue
+            std, rank = hit
+            if std not in ranks or rank < ranks[std]:
+                resolved[std] = col
+                ranks[std] = rank
+
+        missing = [name for name in self._REQUIRED if name not in resolved]
         if missing:
             raise ValueError(f"Could not infer NGX columns for: {missing}")
 
-        df = raw[[symbol_col, open_col, high_col, low_col, close_col, volume_col]].copy()
-        df.columns = ["symbol", "open", "high", "low", "close", "volume"]
-
         # Attach date
         if trading_date is not None:
-            df["date"] = trading_date
+            date_expr = "CAST(? AS DATE)"
+            params = [trading_date]
         else:
             # If the file itself has a date column, use it; otherwise error.
-            date_col = cols_lower.get("date")
+            date_col = resolved.get("date")
             if date_col:
-                df["date"] = pd.to_datetime(raw[date_col]).dt.date
+                col = _quote(date_col)
+                # ISO text and DATE/TIMESTAMP columns cast directly; anything
+                # else must match an NGX layout, or STRPTIME raises
+                date_expr = (
+                    f"COALESCE(TRY_CAST({col} AS DATE), "
+                    f"STRPTIME(CAST({col} AS VARCHAR), {_NGX_DATE_FORMATS})::DATE)"
+                )
+                params = []
             else:
                 raise ValueError("No trading_date provided and no 'Date' column in file")
 
-        # Basic cleaning
-        df["symbol"] = df["symbol"].astype(str).str.strip().str.upper()
-        df["volume"] = df["volume"].fillna(0).astype("int64")
+        # Rename, clean and cast in one vectorized DuckDB projection
+        query = f"""
+            SELECT
+                {date_expr} AS date,
+                CAST({_quote(resolved["open"])} AS DOUBLE) AS open,
+                CAST({_quote(resolved["high"])} AS DOUBLE) AS high,
+                CAST({_quote(resolved["low"])} AS DOUBLE) AS low,
+                CAST({_quote(resolved["close"])} AS DOUBLE) AS close,
+                COALESCE(TRY_CAST({_quote(resolved["volume"])} AS BIGINT), 0) AS volume,
+                UPPER(TRIM(CAST({_quote(resolved["symbol"])} AS VARCHAR))) AS symbol
+            FROM raw
+        """
+        return query, params
+
 
-        return df[["date", "open", "high", "low", "close", "volume", "symbol"]]
+def _quote(name: str) -> str:
+    """Quote a source header as a DuckDB identifier."""
+    return '"' + str(name).replace('"', '""') + '"'
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import atexit
+import functools
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+from .cache import write_bytes_atomic
+
+# Directories already created by download_pdf, so a batch into one
+# directory costs one mkdir instead of one per file
+_made_dirs: set[Path] = set()
+
+_client_lock = threading.Lock()
+
+
+def _http_client() -> httpx.Client:
+    """
+    Process-wide keep-alive client: downloads (including concurrent ones
+    from the pipeline's thread pool) reuse pooled TCP/TLS connections
+    instead of handshaking per PDF.
+    """
+    # lru_cache alone would let racing first callers each build a client
+    with _client_lock:
+        return _new_http_client()
+
+
+@functools.lru_cache(maxsize=1)
+def _new_http_client() -> httpx.Client:
+    client = httpx.Client(
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+        timeout=60,
+        follow_redirects=True,  # as requests.get did
+    )
+    atexit.register(client.close)
+    return client
+
+
+def pdf_path(pdf_url: str, dest_dir: Path) -> Path:
+    """
+    Local file for ``pdf_url``: named by the URL's sha1, which is stable across
+    runs and providers and, unlike the URL's basename, unique per URL.
+    """
+    return dest_dir / f"{hashlib.sha1(pdf_url.encode('utf-8')).hexdigest()}.pdf"
+
+
+def download_pdf(pdf_url: str, dest_dir: Path) -> Optional[Path]:
+    """Download a PDF if pdf_url is non-empty; return local Path or None."""
+    if not pdf_url:
+        return None
+
+    if dest_dir not in _made_dirs:
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        _made_dirs.add(dest_dir)
+
+    dest_path = pdf_path(pdf_url, dest_dir)
+
+    # Only complete files ever appear under dest_path (written atomically)
+    if dest_path.exists():
+        return dest_path
+
+    resp = _http_client().get(pdf_url)
+    resp.raise_for_status()
+    write_bytes_atomic(dest_path, resp.content)
+
+    return dest_path
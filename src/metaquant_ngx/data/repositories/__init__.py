@@ -1,5 +1,28 @@
-from .price_repository import PriceRepository
-from .security_repository import SecurityRepository
-from .filings_repository import FilingsRepository
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .filings_repository import FilingsRepository
+    from .price_repository import PriceRepository
+    from .security_repository import SecurityRepository
+
+# Resolved on first attribute access (PEP 562) so importing the package does
+# not pull in DuckDB/pandas.
+_LAZY = {
+    "PriceRepository": ".price_repository",
+    "SecurityRepository": ".security_repository",
+    "FilingsRepository": ".filings_repository",
+}
 
 __all__ = ["PriceRepository", "SecurityRepository", "FilingsRepository"]
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
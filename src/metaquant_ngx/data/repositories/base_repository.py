@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import duckdb
+
+from ..connection import open_cursor
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class BaseRepository:
+    """
+    Shared plumbing for the DuckDB repositories: every method runs on
+    ``self._con``.
+
+    Pass ``con`` to run several repositories on one connection (e.g. one
+    per script, inside a single ``transaction``); otherwise the repository
+    opens its own cursor on the pooled connection for ``db_path``.
+
+    Tables and indexes are created by ``bootstrap_schema`` when the pool
+    first opens a database, not here.
+    """
+
+    def __init__(
+        self, db_path: str | None = None, con: duckdb.DuckDBPyConnection | None = None
+    ) -> None:
+        self.db_path = db_path
+        self._con = con if con is not None else open_cursor(db_path)
+
+
+def select_columns(df: pd.DataFrame, required: list[str], kind: str) -> pd.DataFrame:
+    """
+    Return ``df`` with exactly the ``required`` columns, in order, matching
+    headers case-insensitively.
+
+    Frames that already have exactly those headers (what the providers emit)
+    are returned as-is: no rename, no projection copy.
+    """
+    if list(df.columns) == required:
+        return df
+
+    cols = {str(c).lower(): c for c in df.columns}
+    missing = [c for c in required if c not in cols]
+    if missing:
+        raise ValueError(f"Missing required columns in {kind} DataFrame: {missing}")
+
+    rename = {cols[c]: c for c in required if cols[c] != c}
+    return (df.rename(columns=rename) if rename else df).loc[:, required]
@@ -1,12 +1,21 @@
 from __future__ import annotations
 
-from datetime import date
-import pandas as pd
+import os
+from datetime import date, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import duckdb
 
 from ..connection import get_connection
+from ..connection.schema import ensure_unique_index
+from .base_repository import BaseRepository, select_columns
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
-class FilingsRepository:
+class FilingsRepository(BaseRepository):
     """
     Stores corporate filings metadata (NGX disclosures).
 
@@ -16,35 +25,46 @@ class FilingsRepository:
         disclosure_title   TEXT
         disclosure_type    TEXT
         disclosure_date    DATE
-        source_url         TEXT   -- NGX web page / link
+        source_url         TEXT   -- NGX web page / link (company profile)
         pdf_url            TEXT   -- direct PDF link if available
         local_pdf_path     TEXT   -- where we saved the PDF locally
+
+    A filing is identified by (source_url, disclosure_title, disclosure_date);
+    source_url alone is shared by all of a company's filings.
+
+    The read queries are prepared once per instance on its connection, so
+    an instance should be used from one thread at a time.
     """
 
-    def __init__(self, db_path: str | None = None) -> None:
-        self.db_path = db_path
-        with get_connection(self.db_path) as con:
-            con.execute(
-                """
-                CREATE TABLE IF NOT EXISTS corporate_filings (
-                    company_name TEXT,
-                    symbol TEXT,
-                    disclosure_title TEXT,
-                    disclosure_type TEXT,
-                    disclosure_date DATE,
-                    source_url TEXT,
-                    pdf_url TEXT,
-                    local_pdf_path TEXT
-                )
-                """
-            )
+    def __init__(
+        self, db_path: str | None = None, con: duckdb.DuckDBPyConnection | None = None
+    ) -> None:
+        super().__init__(db_path, con)
+        # Parsed/bound/optimized once; fetch_* only EXECUTE them
+        self._con.execute(
+            """
+            PREPARE q_filings_latest AS
+            SELECT *
+            FROM corporate_filings
+            ORDER BY disclosure_date DESC
+            LIMIT $1
+            """
+        )
+        self._con.execute(
+            """
+            PREPARE q_filings_since AS
+            SELECT *
+            FROM corporate_filings
+            WHERE disclosure_date >= $1
+            ORDER BY disclosure_date
+            """
+        )
 
     def upsert(self, df: pd.DataFrame) -> None:
-        """Insert only filings whose source_url is not already in the table."""
+        """Insert only filings whose (source_url, title, date) is not already stored."""
         if df is None or df.empty:
             return
 
-        cols = {c.lower(): c for c in df.columns}
         required = [
             "company_name",
             "symbol",
@@ -55,45 +75,90 @@ class FilingsRepository:
             "pdf_url",
             "local_pdf_path",
         ]
-        missing = [c for c in required if c not in cols]
-        if missing:
-            raise ValueError(f"Missing required columns in filings DataFrame: {missing}")
+        df_norm = select_columns(df, required, "filings")
 
-        df_norm = df.rename(columns={cols[c]: c for c in required})[required]
-
-        with get_connection(self.db_path) as con:
-            con.register("filings_df", df_norm)
-            con.execute(
+        # Rows without a link have no dedup key, so they are skipped. The
+        # unique index ignores keys with a NULL part (e.g. an unparsed date),
+        # so stored rows are also matched NULL-safely; ON CONFLICT then only
+        # settles duplicates within the batch.
+        self._con.register("filings_df", df_norm)
+        try:
+            self._con.execute(
                 """
                 INSERT INTO corporate_filings
                 SELECT *
-                FROM filings_df
-                WHERE source_url NOT IN (
-                    SELECT DISTINCT source_url FROM corporate_filings
-                )
+                FROM filings_df s
+                WHERE s.source_url IS NOT NULL
+                  AND NOT EXISTS (
+                    SELECT 1
+                    FROM corporate_filings c
+                    WHERE c.source_url = s.source_url
+                      AND c.disclosure_title IS NOT DISTINCT FROM s.disclosure_title
+                      AND c.disclosure_date IS NOT DISTINCT FROM s.disclosure_date
+                  )
+                ON CONFLICT (source_url, disclosure_title, disclosure_date) DO NOTHING
                 """
             )
+        except duckdb.BinderException:
+            # No unique index to conflict on: bootstrap found duplicate keys.
+            # Raises the error naming them.
+            ensure_unique_index(self._con, "corporate_filings")
+            raise
+        finally:
+            self._con.unregister("filings_df")
 
     def fetch_latest(self, limit: int = 50) -> pd.DataFrame:
-        with get_connection(self.db_path) as con:
-            return con.execute(
+        # EXECUTE can't take bound parameters; render the validated int literal
+        return self._con.execute(f"EXECUTE q_filings_latest({int(limit)})").df()
+
+    def fetch_since(self, since: date | str) -> pd.DataFrame:
+        # Rendered as a DATE literal (see fetch_latest); ISO strings are
+        # accepted, as they were when the value was bound
+        if isinstance(since, str):
+            since = datetime.fromisoformat(since)
+        return self._con.execute(f"EXECUTE q_filings_since(DATE '{since:%Y-%m-%d}')").df()
+
+    def export_snapshot(self, path: str | Path) -> Path:
+        """
+        Write the whole table to a zstd Parquet snapshot at ``path``.
+
+        Readers of the snapshot (see ``fetch_since_parquet``) don't touch the
+        DuckDB file, so they neither take nor wait on its lock. The file is
+        written next to ``path`` and swapped in, so readers never see a
+        partial snapshot.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            self._con.execute(
+                f"""
+                COPY (SELECT * FROM corporate_filings ORDER BY disclosure_date)
+                TO {_sql_string(tmp)}
+                (FORMAT 'parquet', COMPRESSION 'zstd', ROW_GROUP_SIZE 100000)
                 """
-                SELECT *
-                FROM corporate_filings
-                ORDER BY disclosure_date DESC
-                LIMIT ?
-                """,
-                [limit],
-            ).df()
+            )
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return path
 
-    def fetch_since(self, since: date) -> pd.DataFrame:
-        with get_connection(self.db_path) as con:
+    @staticmethod
+    def fetch_since_parquet(since: date, snapshot: str | Path) -> pd.DataFrame:
+        """``fetch_since`` against a snapshot written by ``export_snapshot``."""
+        with get_connection(":memory:") as con:
             return con.execute(
                 """
                 SELECT *
-                FROM corporate_filings
+                FROM read_parquet(?)
                 WHERE disclosure_date >= ?
                 ORDER BY disclosure_date
                 """,
-                [since],
+                [str(snapshot), since],
             ).df()
+
+
+def _sql_string(value: str | Path) -> str:
+    """Render ``value`` as a single-quoted SQL string literal."""
+    return "'" + str(value).replace("'", "''") + "'"
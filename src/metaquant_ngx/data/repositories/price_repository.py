@@ -1,10 +1,33 @@
 from __future__ import annotations
 
-import pandas as pd
-from ..connection import get_connection
+import functools
+from typing import TYPE_CHECKING, Sequence
 
+import duckdb
 
-class PriceRepository:
+from ..connection import transaction
+from ..connection.schema import ensure_unique_index
+from ..models.price import PriceBar
+from .base_repository import BaseRepository, select_columns
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+_COLUMNS = ["date", "open", "high", "low", "close", "volume", "symbol"]
+
+# One fixed statement for every fetch: symbols bind as a single list and the
+# optional bounds as NULL-able dates, so no SQL is built per call.
+_FETCH_SQL = """
+    SELECT * FROM eod_prices
+    WHERE symbol = ANY($1::VARCHAR[])
+      AND ($2::DATE IS NULL OR date >= $2)
+      AND ($3::DATE IS NULL OR date <= $3)
+    ORDER BY symbol, date
+"""
+
+
+class PriceRepository(BaseRepository):
     """
     Daily OHLCV table in DuckDB.
 
@@ -13,65 +36,137 @@ class PriceRepository:
     - open, high, low, close
     - volume
     - symbol  (e.g. 'MTNN')
-    """
 
-    def __init__(self, db_path: str | None = None) -> None:
-        self.db_path = db_path
-        with get_connection(self.db_path) as con:
-            con.execute(
-                """
-                CREATE TABLE IF NOT EXISTS eod_prices (
-                    date DATE,
-                    open DOUBLE,
-                    high DOUBLE,
-                    low DOUBLE,
-                    close DOUBLE,
-                    volume BIGINT,
-                    symbol TEXT
-                )
-                """
-            )
+    Rows are unique on (symbol, date); re-ingesting a day keeps the existing rows.
+
+    Each batch is inserted sorted by (symbol, date), so row groups are
+    clustered and ``fetch``'s symbol/date predicates prune via zone maps.
+    Batches only cluster within themselves; after large backfills, rewrite
+    the table in order to re-cluster it:
 
-    def upsert(self, df: pd.DataFrame) -> None:
+        CREATE OR REPLACE TABLE eod_prices AS
+            SELECT * FROM eod_prices ORDER BY symbol, date;
+
+    (then re-create the indexes with ``bootstrap_schema(con)``).
+
+    ``upsert`` also accepts a pyarrow Table / RecordBatch (scanned by DuckDB
+    in place, no pandas conversion) or a sequence of ``PriceBar`` objects,
+    which are packed straight into an Arrow batch.
+    """
+
+    def upsert(
+        self, df: pd.DataFrame | pa.Table | pa.RecordBatch | Sequence[PriceBar]
+    ) -> None:
         """Insert a batch of rows into eod_prices."""
-        if df is None or df.empty:
+        # Imported on first use, so the CLIs' --help and argument errors
+        # don't pay for pandas
+        import pandas as pd
+
+        if isinstance(df, (list, tuple)):
+            if df:
+                self._insert(PriceBar.to_record_batch(df))
+            return
+
+        if df is None:
             return
 
-        # normalize columns
-        cols = {c.lower(): c for c in df.columns}
-        required = ["date", "open", "high", "low", "close", "volume", "symbol"]
-        missing = [c for c in required if c not in cols]
+        if not isinstance(df, pd.DataFrame):
+            # Arrow: select/rename only touch the schema, buffers are reused
+            if df.num_rows:
+                source = self._source_columns(df.schema.names)
+                batch = df.select(source).rename_columns(_COLUMNS)
+                if batch.schema != _eod_schema():
+                    batch = batch.cast(_eod_schema())
+                self._insert(batch)
+            return
+
+        if df.empty:
+            return
+
+        self._insert(self._cast(select_columns(df, _COLUMNS, "EOD")))
+
+    @staticmethod
+    def _cast(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Cast columns to eod_prices' types (as Arrow-backed dtypes) up front,
+        so DuckDB reads matching buffers instead of casting per row. Columns
+        that already match, e.g. everything NgxEodProvider emits, are left
+        alone.
+        """
+        import pandas as pd
+
+        casts = {
+            field.name: pd.ArrowDtype(field.type)
+            for field in _eod_schema()
+            if df[field.name].dtype != pd.ArrowDtype(field.type)
+        }
+        return df.astype(casts) if casts else df
+
+    @staticmethod
+    def _source_columns(names) -> list[str]:
+        """Incoming column names matching _COLUMNS, case-insensitively, in order."""
+        cols = {c.lower(): c for c in names}
+        missing = [c for c in _COLUMNS if c not in cols]
         if missing:
             raise ValueError(f"Missing required columns in EOD DataFrame: {missing}")
+        return [cols[c] for c in _COLUMNS]
 
-        df_norm = df.rename(columns={cols[c]: c for c in required})[required]
+    def _insert(self, batch) -> None:
+        """Append a DataFrame / Arrow batch already in eod_prices column order."""
+        # The Appender can't skip duplicates, so it fills a temp staging
+        # table and ON CONFLICT decides what reaches eod_prices. Stage,
+        # sorted insert and drop commit once (or join the caller's
+        # transaction).
+        import pandas as pd
 
-        with get_connection(self.db_path) as con:
-            con.register("eod_df", df_norm)
-            con.execute("INSERT INTO eod_prices SELECT * FROM eod_df")
+        with transaction(self._con) as con:
+            con.execute("CREATE OR REPLACE TEMP TABLE eod_stage AS FROM eod_prices LIMIT 0")
+            if isinstance(batch, pd.DataFrame):
+                con.append("eod_stage", batch)
+            else:
+                # append() only takes DataFrames; Arrow goes through a scan
+                con.register("eod_df", batch)
+                try:
+                    con.execute("INSERT INTO eod_stage SELECT * FROM eod_df")
+                finally:
+                    con.unregister("eod_df")
+            # Sorted so row groups cluster by (symbol, date); with
+            # preserve_insertion_order off the scan side runs in parallel
+            try:
+                con.execute(
+                    """
+                    INSERT INTO eod_prices
+                    SELECT * FROM eod_stage
+                    ORDER BY symbol, date
+                    ON CONFLICT (symbol, date) DO NOTHING
+                    """
+                )
+            except duckdb.BinderException:
+                # No unique index to conflict on: bootstrap found duplicate
+                # keys. Raises the error naming them.
+                ensure_unique_index(con, "eod_prices")
+                raise
+            con.execute("DROP TABLE eod_stage")
 
     def fetch(self, symbols, start=None, end=None) -> pd.DataFrame:
         """Fetch OHLCV for a list of symbols and optional date range."""
+        # The Arrow table is dropped as its columns are converted, so peak
+        # memory stays near one copy of the result.
+        return self.fetch_arrow(symbols, start, end).to_pandas(
+            split_blocks=True, self_destruct=True, date_as_object=False
+        )
+
+    def fetch_arrow(self, symbols, start=None, end=None) -> pa.Table:
+        """``fetch`` as an Arrow table; OHLCV columns are primitive, zero-copy to NumPy."""
+        # Lists/tuples bind as VARCHAR[] as they are; only other iterables
+        # (sets, Series, generators) are copied
         if isinstance(symbols, str):
-            symbols = [symbols]
+            symbols = (symbols,)
+        elif not isinstance(symbols, (list, tuple)):
+            symbols = tuple(symbols)
+
+        return self._con.execute(_FETCH_SQL, (symbols, start, end)).fetch_arrow_table()
 
-        placeholders = ",".join(["?"] * len(symbols))
-        query = f"""
-            SELECT * FROM eod_prices
-            WHERE symbol IN ({placeholders})
-        """
-        params = list(symbols)
-
-        if start is not None:
-            query += " AND date >= ?"
-            params.append(start)
-        if end is not None:
-            query += " AND date <= ?"
-            params.append(end)
-
-        with get_connection(self.db_path) as con:
-            return con.execute(query, params).df()
-    
     def fetch_latest(self):
         query = """
         SELECT *
@@ -79,6 +174,22 @@ class PriceRepository:
         WHERE date = (SELECT max(date) FROM eod_prices)
         ORDER BY symbol
         """
-        from ..connection import get_connection
-        with get_connection(self.db_path) as con:
-            return con.execute(query).df()
+        return self._con.execute(query).df()
+
+
+@functools.cache
+def _eod_schema() -> pa.Schema:
+    """Arrow schema matching the eod_prices table."""
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            ("date", pa.date32()),
+            ("open", pa.float64()),
+            ("high", pa.float64()),
+            ("low", pa.float64()),
+            ("close", pa.float64()),
+            ("volume", pa.int64()),
+            ("symbol", pa.string()),
+        ]
+    )
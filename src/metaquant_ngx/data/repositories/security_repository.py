@@ -1,52 +1,49 @@
 from __future__ import annotations
 
-import pandas as pd
-from ..connection import get_connection
+from typing import TYPE_CHECKING
 
+from .base_repository import BaseRepository, select_columns
 
-class SecurityRepository:
-    """Securities master table: basic metadata for each ticker."""
+if TYPE_CHECKING:
+    import pandas as pd
 
-    def __init__(self, db_path: str | None = None) -> None:
-        self.db_path = db_path
-        with get_connection(self.db_path) as con:
-            con.execute(
-                """
-                CREATE TABLE IF NOT EXISTS securities (
-                    ticker TEXT PRIMARY KEY,
-                    company TEXT,
-                    sector TEXT,
-                    industry TEXT
-                )
-                """
-            )
+
+class SecurityRepository(BaseRepository):
+    """Securities master table: basic metadata for each ticker."""
 
     def upsert(self, df: pd.DataFrame) -> None:
         if df is None or df.empty:
             return
 
-        cols = {c.lower(): c for c in df.columns}
-        required = ["ticker", "company", "sector", "industry"]
-        missing = [c for c in required if c not in cols]
-        if missing:
-            raise ValueError(
-                f"Missing required columns in securities DataFrame: {missing}"
-            )
+        df_norm = select_columns(df, ["ticker", "company", "sector", "industry"], "securities")
 
-        df_norm = df.rename(columns={cols[c]: c for c in required})[required]
+        # MERGE rejects a source that matches one target row twice; keep the
+        # first row per ticker, as the old INSERT OR REPLACE did
+        dup = df_norm["ticker"].duplicated()
+        if dup.any():
+            df_norm = df_norm[~dup]
 
-        with get_connection(self.db_path) as con:
-            con.register("sec_df", df_norm)
-            con.execute(
+        # One join against the key: update known tickers, insert new ones
+        self._con.register("sec_df", df_norm)
+        try:
+            self._con.execute(
                 """
-                INSERT OR REPLACE INTO securities (ticker, company, sector, industry)
-                SELECT ticker, company, sector, industry FROM sec_df
+                MERGE INTO securities t
+                USING sec_df s
+                ON t.ticker = s.ticker
+                WHEN MATCHED THEN UPDATE SET
+                    company = s.company,
+                    sector = s.sector,
+                    industry = s.industry
+                WHEN NOT MATCHED THEN INSERT (ticker, company, sector, industry)
+                    VALUES (s.ticker, s.company, s.sector, s.industry)
                 """
             )
+        finally:
+            self._con.unregister("sec_df")
 
     def list_tickers(self) -> list[str]:
-        with get_connection(self.db_path) as con:
-            rows = con.execute(
-                "SELECT ticker FROM securities ORDER BY ticker"
-            ).fetchall()
+        rows = self._con.execute(
+            "SELECT ticker FROM securities ORDER BY ticker"
+        ).fetchall()
         return [r[0] for r in rows]
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
-from ..core import settings
+from ..core.config import get_settings
 from ..data.providers.ngx_disclosure_playwright_provider import (
     NgxDisclosurePlaywrightProvider as NgxDisclosureProvider,
 )
 
+from ..data.connection import get_connection, transaction
 from ..data.repositories import FilingsRepository
 
 
@@ -20,22 +23,26 @@ def run(since: date | None = None) -> int:
 
     Returns the number of filings ingested (after filtering and dedup).
     """
+    settings = get_settings()
     provider = NgxDisclosureProvider()
-    repo = FilingsRepository()
 
     df = provider.fetch_page()
-    if df.empty:
+    if len(df) == 0:
         print("No disclosures found on page.")
         return 0
 
-    # Filter by date if requested
+    # datetime64 once at the boundary, so the filter below is a NumPy
+    # compare instead of per-object `date` comparisons (DuckDB casts it
+    # back to DATE on insert)
+    df["disclosure_date"] = pd.to_datetime(df["disclosure_date"], errors="coerce")
+
+    # Filter by date if requested; NaT compares False, so no notna() pass
     if since is not None:
-        df = df[
-            df["disclosure_date"].notna()
-            & (df["disclosure_date"] >= since)
-        ]
+        mask = df["disclosure_date"].to_numpy() >= np.datetime64(since)
+        df = df.iloc[mask]
 
-    if df.empty:
+    n = len(df)
+    if n == 0:
         print(f"No disclosures on or after {since}.")
         return 0
 
@@ -50,25 +57,29 @@ def run(since: date | None = None) -> int:
         "pdf_url",
         "local_pdf_path",
     ]
-    for col in required_cols:
-        if col not in df.columns:
-            df[col] = None
-
-    # Download PDFs
-    dest_dir = Path(settings.NGX_DISCLOSURES_DATA_DIR)
-    local_paths: list[str | None] = []
-
-    for _, row in df.iterrows():
-        pdf_url = row.get("pdf_url")
-        if pdf_url:
-            local = provider.download_pdf(pdf_url, dest_dir)
-            local_paths.append(str(local) if local is not None else None)
-        else:
-            local_paths.append(None)
-
-    df["local_pdf_path"] = local_paths
-
-    # Upsert into DB
-    repo.upsert(df)
-    print(f"Ingested/updated {len(df)} corporate filings.")
-    return len(df)
+    missing = [col for col in required_cols if col not in df.columns]
+    if missing:
+        # one assign: a single block rebuild instead of one per column
+        df = df.assign(**dict.fromkeys(missing, None))
+
+    # Download PDFs; network-bound, so overlap them on a thread pool.
+    # Resolved and created once here, not per file; the stored paths are
+    # absolute, so they stay valid whatever the reader's working directory.
+    dest_dir = Path(settings.NGX_DISCLOSURES_DATA_DIR).resolve()
+    dest_dir.mkdir(parents=True, exist_ok=True)
+
+    def download(pdf_url) -> Path | None:
+        if not isinstance(pdf_url, str) or not pdf_url:
+            return None
+        return provider.download_pdf(pdf_url, dest_dir)
+
+    with ThreadPoolExecutor(max_workers=settings.NGX_PDF_DOWNLOAD_WORKERS) as pool:
+        # map() keeps results in row order
+        results = list(pool.map(download, df["pdf_url"].tolist()))
+    df["local_pdf_path"] = [str(p) if p is not None else None for p in results]
+
+    # Upsert into DB: one connection, schema check + insert in one commit
+    with get_connection() as con, transaction(con):
+        FilingsRepository(con=con).upsert(df)
+    print(f"Ingested/updated {n} corporate filings.")
+    return n
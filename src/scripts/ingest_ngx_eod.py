@@ -15,13 +15,13 @@ from datetime import datetime, date
 from pathlib import Path
 
 from metaquant_ngx.core import config
+from metaquant_ngx.data.connection import get_connection, transaction
 from metaquant_ngx.data.providers import NgxEodProvider
 from metaquant_ngx.data.repositories import PriceRepository
 
 
 def run_ingestion(file_path: str, trading_date: str | None = None) -> None:
     provider = NgxEodProvider()
-    repo = PriceRepository()
 
     if trading_date:
         dt = datetime.strptime(trading_date, "%Y-%m-%d").date()
@@ -29,10 +29,14 @@ def run_ingestion(file_path: str, trading_date: str | None = None) -> None:
         # default: derive date from filename or use today
         dt = date.today()
 
-    df = provider.load_file(file_path, trading_date=dt)
-    repo.upsert(df)
+    # Arrow end to end: the parsed file is scanned by DuckDB without pandas
+    table = provider.load_table(file_path, trading_date=dt)
 
-    print(f"Ingested {len(df)} rows into DuckDB for {dt}")
+    # One connection and one commit for the schema check and the insert
+    with get_connection() as con, transaction(con):
+        PriceRepository(con=con).upsert(table)
+
+    print(f"Ingested {table.num_rows} rows into DuckDB for {dt}")
 
 
 def main():